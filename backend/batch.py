@@ -0,0 +1,449 @@
+"""
+Offline bulk question-answering job runner.
+Asks a fixed questionnaire against many resume indexes and streams answers to JSONL.
+
+Run with:
+    python -m backend.batch --questions questions.jsonl --resumes resumes.jsonl --output results.jsonl
+
+Input formats (one JSON object per line):
+    questions.jsonl: {"question_id": "skills", "question": "What are the key skills?"}
+    resumes.jsonl:   {"resume_id": "jane-doe", "index_path": "...", "resume_path": "..."}
+
+"question_id" defaults to the question text. "index_path" defaults to
+RESUME_INDEXES_DIR/<resume_id>; when that index does not exist and "resume_path"
+is given, the index is built from the PDF and saved. Resume ids must be plain
+file names (no path separators or "..").
+
+The output file only holds answers, one record per (resume_id, question_id),
+and doubles as the checkpoint: answered pairs are skipped on restart. Failed
+generations go to "<output stem>.errors.jsonl" next to it; that file is
+replaced on every run and its pairs are retried by the next one.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, Tuple
+
+from backend.config import (
+    OPENAI_API_KEY,
+    EMBEDDING_MODEL,
+    GENERATION_MODEL,
+    TEMPERATURE,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    TOP_K_CHUNKS,
+    RESUME_INDEXES_DIR,
+    BATCH_MAX_WORKERS,
+    BATCH_EMBED_SIZE,
+)
+from backend.loader import ResumeLoader
+from backend.vector_store import VectorStore
+from backend.rag import ResumeRAG
+
+
+def read_jsonl(path: Path, required_keys: Iterable[str] = ()) -> List[dict]:
+    """
+    Read a JSONL file, skipping blank lines.
+    
+    Args:
+        path: Path to the JSONL file
+        required_keys: Keys every record must have as a non-empty string
+    
+    Returns:
+        List of parsed records
+    
+    Raises:
+        ValueError: If a line is not valid JSON or lacks a required key
+    """
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number} of {path}: {str(e)}")
+            
+            if not isinstance(record, dict):
+                raise ValueError(f"Expected a JSON object on line {line_number} of {path}")
+            for key in required_keys:
+                value = record.get(key)
+                if not isinstance(value, str) or not value.strip():
+                    raise ValueError(f"Missing or empty \"{key}\" on line {line_number} of {path}")
+            
+            records.append(record)
+    return records
+
+
+def load_checkpoint(output_path: Path) -> Set[Tuple[str, str]]:
+    """
+    Collect already answered (resume_id, question_id) pairs from a previous run.
+    
+    A trailing partial line left by a crash is truncated so that appended
+    results start on a fresh line. Records without an "answer" are ignored.
+    
+    Args:
+        output_path: Path to the results JSONL file
+    
+    Returns:
+        Set of completed (resume_id, question_id) pairs
+    """
+    done: Set[Tuple[str, str]] = set()
+    
+    if not output_path.exists():
+        return done
+    
+    with open(output_path, 'rb') as f:
+        data = f.read()
+    
+    # Drop an incomplete last line written before a crash
+    if data and not data.endswith(b"\n"):
+        data = data[:data.rfind(b"\n") + 1]
+        with open(output_path, 'r+b') as f:
+            f.truncate(len(data))
+    
+    for line in data.decode('utf-8').splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "answer" in record:
+            done.add((record["resume_id"], record["question_id"]))
+    
+    return done
+
+
+def errors_path_for(output_path: Path) -> Path:
+    """Return the path of the errors file that accompanies a results file."""
+    return output_path.with_name(f"{output_path.stem}.errors.jsonl")
+
+
+def is_safe_resume_id(resume_id: str) -> bool:
+    """
+    Check that a resume id can be used as a file name inside the indexes directory.
+    
+    Ids with path separators or ".." could read and write index files
+    outside that directory and are rejected.
+    
+    Args:
+        resume_id: Resume identifier from the input file
+    
+    Returns:
+        True if the id is a non-empty plain file name
+    """
+    return (
+        isinstance(resume_id, str)
+        and resume_id.strip() != ""
+        and "/" not in resume_id
+        and "\\" not in resume_id
+        and ".." not in resume_id
+    )
+
+
+class ResultWriter:
+    """Thread-safe, line-buffered JSONL writer for job results."""
+    
+    def __init__(self, output_path: Path):
+        """
+        Initialize the ResultWriter. The file is opened for appending on the first write.
+        
+        Args:
+            output_path: Path to the JSONL file
+        """
+        self.output_path = output_path
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def write(self, record: dict) -> None:
+        """Append one record and flush it so a crash loses at most in-flight work."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.output_path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._file.flush()
+    
+    def close(self) -> None:
+        """Close the underlying file, if it was opened."""
+        if self._file is not None:
+            self._file.close()
+
+
+class JobStats:
+    """Thread-safe counters and stage timings for a batch run."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.resumes_processed = 0
+        self.resumes_failed = 0
+        self.resumes_skipped = 0
+        self.answers_written = 0
+        self.answers_skipped = 0
+        self.errors = 0
+        self.embed_seconds = 0.0
+        self.retrieve_seconds = 0.0
+        self.generate_seconds = 0.0
+    
+    def add(self, **increments) -> None:
+        """Add the given amounts to the named counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+    
+    def summary(self, elapsed: float) -> str:
+        """Format a human-readable throughput summary."""
+        elapsed = max(elapsed, 1e-9)
+        lines = [
+            "=" * 60,
+            "Batch job summary",
+            "=" * 60,
+            f"Resumes processed:   {self.resumes_processed}",
+            f"Resumes skipped:     {self.resumes_skipped} (already complete)",
+            f"Resumes failed:      {self.resumes_failed}",
+            f"Answers written:     {self.answers_written}",
+            f"Answers skipped:     {self.answers_skipped} (checkpoint)",
+            f"Generation errors:   {self.errors}",
+            f"Elapsed:             {elapsed:.1f}s",
+            f"Throughput:          {self.answers_written / elapsed:.2f} answers/s, "
+            f"{self.resumes_processed * 60 / elapsed:.1f} resumes/min",
+            f"Embedding time:      {self.embed_seconds:.1f}s",
+            f"Retrieval time:      {self.retrieve_seconds:.1f}s",
+            f"Generation time:     {self.generate_seconds:.1f}s (summed across workers)",
+            "=" * 60,
+        ]
+        return "\n".join(lines)
+
+
+class BatchRunner:
+    """Runs a questionnaire against many resumes with pipelined retrieval and generation."""
+    
+    def __init__(self, openai_api_key: str, indexes_dir: Path = RESUME_INDEXES_DIR,
+                 max_workers: int = BATCH_MAX_WORKERS, k: int = TOP_K_CHUNKS,
+                 embed_batch_size: int = BATCH_EMBED_SIZE):
+        """
+        Initialize the BatchRunner.
+        
+        Args:
+            openai_api_key: OpenAI API key for embeddings and generation
+            indexes_dir: Directory holding one FAISS index per resume id
+            max_workers: Maximum number of concurrent generation requests
+            k: Number of chunks retrieved per question
+            embed_batch_size: Number of questions embedded per API call
+        """
+        self.openai_api_key = openai_api_key
+        self.indexes_dir = Path(indexes_dir)
+        self.max_workers = max_workers
+        self.k = k
+        self.embed_batch_size = embed_batch_size
+        
+        # One embeddings client and one LLM client shared by every resume
+        self.base_store = VectorStore(
+            openai_api_key=openai_api_key,
+            embedding_model=EMBEDDING_MODEL
+        )
+        self.rag = ResumeRAG(
+            vector_store=self.base_store,
+            openai_api_key=openai_api_key,
+            model_name=GENERATION_MODEL,
+            temperature=TEMPERATURE
+        )
+        self.stats = JobStats()
+    
+    def _open_resume_store(self, resume: dict) -> VectorStore:
+        """
+        Load (or build) the FAISS index for one resume.
+        
+        Args:
+            resume: Resume record with "resume_id" and optional "index_path"/"resume_path"
+        
+        Returns:
+            VectorStore with the resume's index loaded
+        
+        Raises:
+            ValueError: If the resume id is not a safe file name
+            FileNotFoundError: If no index exists and it cannot be built
+        """
+        resume_id = resume["resume_id"]
+        if not is_safe_resume_id(resume_id):
+            raise ValueError(f"Invalid resume_id '{resume_id}': must not contain path separators or '..'")
+        
+        index_path = resume.get("index_path") or self.indexes_dir / resume_id
+        
+        store = VectorStore(
+            openai_api_key=self.openai_api_key,
+            index_path=str(index_path),
+            embeddings=self.base_store.embeddings
+        )
+        if store.load_index():
+            return store
+        
+        resume_path = resume.get("resume_path")
+        if not resume_path:
+            raise FileNotFoundError(f"No index found for resume '{resume_id}' at {index_path}")
+        
+        Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+        loader = ResumeLoader(
+            resume_path=resume_path,
+            chunk_size=CHUNK_SIZE,
+            chunk_overlap=CHUNK_OVERLAP
+        )
+        store.create_index(loader.load_resume())
+        store.save_index()
+        return store
+    
+    def _generate(self, writer: ResultWriter, error_writer: ResultWriter, resume_id: str,
+                  question: dict, chunks: List[str]) -> None:
+        """Generate one answer and write it to the results or errors file."""
+        record = {
+            "resume_id": resume_id,
+            "question_id": question["question_id"],
+            "question": question["question"],
+        }
+        
+        started = time.perf_counter()
+        try:
+            record["answer"] = self.rag.answer_from_chunks(question["question"], chunks)
+        except Exception as e:
+            record["error"] = str(e)
+        self.stats.add(generate_seconds=time.perf_counter() - started)
+        
+        if "error" in record:
+            error_writer.write(record)
+            self.stats.add(errors=1)
+        else:
+            writer.write(record)
+            self.stats.add(answers_written=1)
+    
+    def run(self, questions: List[dict], resumes: List[dict], output_path: Path) -> JobStats:
+        """
+        Answer every question for every resume, resuming from the output checkpoint.
+        
+        Retrieval for the next resume overlaps with generation for the previous
+        ones; the number of queued generation tasks is bounded so index loading
+        never runs far ahead of the workers.
+        
+        Args:
+            questions: Question records with "question" and optional "question_id"
+            resumes: Resume records with "resume_id"
+            output_path: Path to the results JSONL file; errors go to errors_path_for(output_path)
+        
+        Returns:
+            JobStats for the run
+        """
+        for question in questions:
+            question.setdefault("question_id", question["question"])
+        
+        done = load_checkpoint(output_path)
+        
+        # Errors from a previous run are retried below, so start a fresh errors file
+        errors_path = errors_path_for(output_path)
+        if errors_path.exists():
+            errors_path.unlink()
+        
+        # Embed the questionnaire once; it is shared by every resume
+        started = time.perf_counter()
+        question_vectors = self.base_store.embed_queries(
+            [q["question"] for q in questions],
+            batch_size=self.embed_batch_size
+        )
+        self.stats.add(embed_seconds=time.perf_counter() - started)
+        
+        writer = ResultWriter(output_path)
+        error_writer = ResultWriter(errors_path)
+        pending = threading.BoundedSemaphore(self.max_workers * 4)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for resume in resumes:
+                    resume_id = resume["resume_id"]
+                    todo = [i for i, q in enumerate(questions) if (resume_id, q["question_id"]) not in done]
+                    
+                    self.stats.add(answers_skipped=len(questions) - len(todo))
+                    if not todo:
+                        self.stats.add(resumes_skipped=1)
+                        continue
+                    
+                    started = time.perf_counter()
+                    try:
+                        store = self._open_resume_store(resume)
+                        results = store.search_by_vectors(question_vectors[todo], k=self.k)
+                    except Exception as e:
+                        print(f"WARNING: Skipping resume '{resume_id}': {str(e)}", file=sys.stderr)
+                        self.stats.add(resumes_failed=1)
+                        continue
+                    finally:
+                        self.stats.add(retrieve_seconds=time.perf_counter() - started)
+                    
+                    for i, chunks in zip(todo, results):
+                        pending.acquire()
+                        future = executor.submit(
+                            self._generate, writer, error_writer, resume_id, questions[i], chunks
+                        )
+                        future.add_done_callback(lambda _: pending.release())
+                    
+                    self.stats.add(resumes_processed=1)
+        finally:
+            writer.close()
+            error_writer.close()
+        
+        return self.stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Answer a questionnaire for many resumes.")
+    parser.add_argument("--questions", required=True, type=Path, help="Questions JSONL file")
+    parser.add_argument("--resumes", required=True, type=Path, help="Resume ids JSONL file")
+    parser.add_argument("--output", required=True, type=Path, help="Results JSONL file (also the checkpoint)")
+    parser.add_argument("--indexes-dir", type=Path, default=RESUME_INDEXES_DIR,
+                        help="Directory holding one FAISS index per resume id")
+    parser.add_argument("--workers", type=int, default=BATCH_MAX_WORKERS,
+                        help="Maximum concurrent generation requests")
+    parser.add_argument("--k", type=int, default=TOP_K_CHUNKS, help="Chunks retrieved per question")
+    args = parser.parse_args(argv)
+    
+    if not OPENAI_API_KEY or OPENAI_API_KEY == "your_openai_api_key_here":
+        print("ERROR: OPENAI_API_KEY not found in environment variables.", file=sys.stderr)
+        return 1
+    
+    try:
+        questions = read_jsonl(args.questions, required_keys=("question",))
+        resumes = read_jsonl(args.resumes, required_keys=("resume_id",))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {str(e)}", file=sys.stderr)
+        return 1
+    
+    for resume in resumes:
+        if not is_safe_resume_id(resume["resume_id"]):
+            print(f"ERROR: Invalid resume_id '{resume['resume_id']}' in {args.resumes}: "
+                  f"must not contain path separators or '..'", file=sys.stderr)
+            return 1
+    
+    print(f"Running {len(questions)} questions against {len(resumes)} resumes...")
+    
+    runner = BatchRunner(
+        openai_api_key=OPENAI_API_KEY,
+        indexes_dir=args.indexes_dir,
+        max_workers=args.workers,
+        k=args.k
+    )
+    
+    started = time.perf_counter()
+    stats = runner.run(questions, resumes, args.output)
+    print(stats.summary(time.perf_counter() - started))
+    if stats.errors:
+        print(f"Failed questions written to {errors_path_for(args.output)}; re-run to retry them.")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark for two-stage candidate matching.
+Compares CandidateIndex.match() against exhaustive chunk scoring on synthetic vectors.
+
+Run with: python -m backend.benchmark_match --sizes 1000 10000 100000
+
+Synthetic resumes are drawn around a shared set of topic vectors so that
+centroid shortlisting faces realistic near-duplicates. Vectors are smaller than
+text-embedding-3-large (3072 dimensions) to keep 100k resumes in memory; latency
+of both methods scales roughly linearly with --dim.
+"""
+
+import argparse
+import time
+from typing import List, Tuple
+import numpy as np
+
+from backend.config import MATCH_TOP_K, MATCH_SHORTLIST_SIZE, MATCH_COARSE_NPROBE
+from backend.matcher import CandidateIndex
+
+
+def make_synthetic_resumes(num_resumes: int, dim: int, avg_chunks: int, num_topics: int,
+                           rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Generate clustered chunk vectors for synthetic resumes.
+    
+    Returns:
+        Tuple of (chunk_vectors, chunk_counts, topics)
+    """
+    topics = rng.standard_normal((num_topics, dim)).astype(np.float32)
+    resume_topics = rng.integers(num_topics, size=num_resumes)
+    resume_vectors = topics[resume_topics] + 0.6 * rng.standard_normal((num_resumes, dim)).astype(np.float32)
+    
+    chunk_counts = rng.integers(1, 2 * avg_chunks, size=num_resumes)
+    owners = np.repeat(np.arange(num_resumes), chunk_counts)
+    chunk_vectors = resume_vectors[owners] + 0.8 * rng.standard_normal((len(owners), dim)).astype(np.float32)
+    
+    return chunk_vectors, chunk_counts, topics
+
+
+def make_queries(topics: np.ndarray, num_queries: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate job-description-like query vectors near random topics."""
+    picks = rng.integers(len(topics), size=num_queries)
+    noise = rng.standard_normal((num_queries, topics.shape[1])).astype(np.float32)
+    return topics[picks] + 0.6 * noise
+
+
+def time_queries(search, queries: np.ndarray) -> Tuple[List[List[str]], np.ndarray]:
+    """Run search for each query and return the ranked ids and per-query latency in ms."""
+    rankings = []
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        results = search(query)
+        latencies.append((time.perf_counter() - started) * 1000)
+        rankings.append([r["resume_id"] for r in results])
+    return rankings, np.array(latencies)
+
+
+def recall(rankings: List[List[str]], reference: List[List[str]]) -> float:
+    """Mean fraction of the reference top-k found by the approximate top-k."""
+    hits = [len(set(r) & set(ref)) / len(ref) for r, ref in zip(rankings, reference) if ref]
+    return float(np.mean(hits))
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark two-stage candidate matching.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Numbers of resumes to benchmark")
+    parser.add_argument("--dim", type=int, default=128, help="Embedding dimension")
+    parser.add_argument("--avg-chunks", type=int, default=4, help="Average chunks per resume")
+    parser.add_argument("--topics", type=int, default=200, help="Number of synthetic topic clusters")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per configuration")
+    parser.add_argument("--top-k", type=int, default=MATCH_TOP_K, help="Candidates returned")
+    parser.add_argument("--shortlist", type=int, nargs="+", default=[MATCH_SHORTLIST_SIZE],
+                        help="Coarse-stage shortlist sizes to compare")
+    parser.add_argument("--nprobe", type=int, default=MATCH_COARSE_NPROBE, help="IVF clusters probed")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(args.seed)
+    
+    print(f"{'resumes':>8} {'chunks':>8} {'method':<24} {'p50 ms':>8} {'p95 ms':>8} {'recall@k':>9}")
+    for num_resumes in args.sizes:
+        chunk_vectors, chunk_counts, topics = make_synthetic_resumes(
+            num_resumes, args.dim, args.avg_chunks, args.topics, rng
+        )
+        queries = make_queries(topics, args.queries, rng)
+        resume_ids = [f"resume-{i}" for i in range(num_resumes)]
+        
+        # IVF with ~sqrt(n) clusters once there are enough centroids to train on
+        nlist = int(np.sqrt(num_resumes))
+        indexes = {"flat": CandidateIndex.from_arrays(resume_ids, chunk_vectors, chunk_counts)}
+        if num_resumes >= 39 * nlist:
+            indexes["ivf"] = CandidateIndex.from_arrays(
+                resume_ids, chunk_vectors, chunk_counts, nlist=nlist, nprobe=args.nprobe
+            )
+        
+        reference, latencies = time_queries(
+            lambda q: indexes["flat"].exhaustive_match(q, top_k=args.top_k), queries
+        )
+        rows = [("exhaustive", latencies, 1.0)]
+        
+        for coarse, index in indexes.items():
+            for shortlist in args.shortlist:
+                rankings, latencies = time_queries(
+                    lambda q: index.match(q, top_k=args.top_k, shortlist_size=shortlist), queries
+                )
+                name = f"two-stage {coarse} s={shortlist}"
+                rows.append((name, latencies, recall(rankings, reference)))
+        
+        for name, latencies, rec in rows:
+            print(f"{num_resumes:>8} {len(chunk_vectors):>8} {name:<24} "
+                  f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 95):>8.2f} {rec:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
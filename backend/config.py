@@ -22,6 +22,9 @@ FAISS_INDEX_DIR = Path(__file__).parent
 FAISS_INDEX_PATH = FAISS_INDEX_DIR / "faiss_index"
 FAISS_CHUNKS_PATH = FAISS_INDEX_DIR / "faiss_index_chunks.pkl"
 
+# Per-resume FAISS indexes for multi-resume jobs (one index per resume id)
+RESUME_INDEXES_DIR = FAISS_INDEX_DIR / "indexes"
+
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 EMBEDDING_MODEL = "text-embedding-3-large"
@@ -33,6 +36,17 @@ CHUNK_SIZE = 800
 CHUNK_OVERLAP = 100
 TOP_K_CHUNKS = 4
 
+# Batch Job Configuration
+BATCH_MAX_WORKERS = 8  # Concurrent generation requests
+BATCH_EMBED_SIZE = 64  # Questions embedded per embeddings API call
+
+# Candidate Matching Configuration
+MATCH_TOP_K = 10  # Candidates returned per job description
+MATCH_SHORTLIST_SIZE = 200  # Resumes kept by the coarse stage for chunk rescoring
+MATCH_CHUNKS_PER_CANDIDATE = 3  # Best-matching chunks returned per candidate
+MATCH_COARSE_NLIST = 0  # IVF clusters for the coarse stage (0 = exact flat search)
+MATCH_COARSE_NPROBE = 16  # IVF clusters probed per query
+
 # API Configuration
 API_HOST = "0.0.0.0"
 API_PORT = 8000
@@ -14,10 +14,10 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import List, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from backend.config import (
     RESUME_PATH,
@@ -30,6 +30,12 @@ from backend.config import (
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     TOP_K_CHUNKS,
+    RESUME_INDEXES_DIR,
+    MATCH_TOP_K,
+    MATCH_SHORTLIST_SIZE,
+    MATCH_CHUNKS_PER_CANDIDATE,
+    MATCH_COARSE_NLIST,
+    MATCH_COARSE_NPROBE,
     API_TITLE,
     API_VERSION,
     CORS_ORIGINS,
@@ -39,10 +45,12 @@ from backend.config import (
 from backend.loader import ResumeLoader
 from backend.vector_store import VectorStore
 from backend.rag import ResumeRAG
+from backend.matcher import CandidateIndex, load_candidate_index
 
 # Global variables for RAG system
 vector_store: Optional[VectorStore] = None
 rag_system: Optional[ResumeRAG] = None
+candidate_index: Optional[CandidateIndex] = None
 
 
 def validate_openai_key() -> str:
@@ -122,11 +130,30 @@ def initialize_rag_system():
         print("Server will start but /ask endpoint will not work until the issue is resolved.")
 
 
+def initialize_candidate_index():
+    """Build the candidate matching index on startup. Failures only disable /match."""
+    global candidate_index
+    
+    try:
+        candidate_index = load_candidate_index(
+            RESUME_INDEXES_DIR,
+            nlist=MATCH_COARSE_NLIST,
+            nprobe=MATCH_COARSE_NPROBE
+        )
+        if candidate_index is None:
+            print(f"No resume indexes found in {RESUME_INDEXES_DIR}. /match endpoint will not work.")
+    except Exception as e:
+        candidate_index = None
+        print(f"WARNING: Failed to build candidate index: {str(e)}")
+        print("Server will start but /match endpoint will not work until the issue is resolved.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI startup/shutdown events."""
     # Startup
     initialize_rag_system()
+    initialize_candidate_index()
     yield
     # Shutdown (if needed in future)
     pass
@@ -161,6 +188,30 @@ class AnswerResponse(BaseModel):
     answer: str
 
 
+class MatchRequest(BaseModel):
+    """Request model for /match endpoint."""
+    job_description: str
+    top_k: int = Field(default=MATCH_TOP_K, ge=1, le=100)
+
+
+class MatchedChunk(BaseModel):
+    """Resume chunk that matched the job description."""
+    text: str
+    score: float
+
+
+class CandidateMatch(BaseModel):
+    """Ranked candidate with its best-matching chunks."""
+    resume_id: str
+    score: float
+    chunks: List[MatchedChunk]
+
+
+class MatchResponse(BaseModel):
+    """Response model for /match endpoint."""
+    candidates: List[CandidateMatch]
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -169,6 +220,7 @@ async def root():
         "version": API_VERSION,
         "endpoints": {
             "/ask": "POST - Ask questions about the resume",
+            "/match": "POST - Rank indexed resumes against a job description",
             "/health": "GET - Health check",
             "/docs": "GET - Interactive API documentation (Swagger UI)"
         }
@@ -194,7 +246,8 @@ async def health_check():
     return {
         "status": "healthy",
         "index_loaded": vector_store.index is not None,
-        "chunks_count": len(vector_store.chunks) if vector_store.chunks else 0
+        "chunks_count": len(vector_store.chunks) if vector_store.chunks else 0,
+        "candidates_count": len(candidate_index) if candidate_index is not None else 0
     }
 
 
@@ -226,6 +279,43 @@ async def ask_question(request: QuestionRequest):
         raise HTTPException(status_code=500, detail=f"Error processing question: {str(e)}")
 
 
+@app.post("/match", response_model=MatchResponse)
+async def match_candidates(request: MatchRequest):
+    """
+    Rank indexed resumes against a job description.
+    
+    Resumes are shortlisted by their centroid vectors, then the shortlist is
+    rescored by its best-matching chunks.
+    
+    Args:
+        request: MatchRequest containing the job description
+        
+    Returns:
+        MatchResponse with the top candidates and their best-matching chunks
+        
+    Raises:
+        HTTPException: If no candidate index is loaded or job description is empty
+    """
+    if candidate_index is None or vector_store is None:
+        raise HTTPException(status_code=503, detail="Candidate index not initialized")
+    
+    if not request.job_description or not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    
+    try:
+        query_vector = vector_store.embeddings.embed_query(request.job_description.strip())
+        candidates = candidate_index.match(
+            query_vector,
+            top_k=request.top_k,
+            shortlist_size=MATCH_SHORTLIST_SIZE,
+            chunks_per_candidate=MATCH_CHUNKS_PER_CANDIDATE
+        )
+        return MatchResponse(candidates=candidates)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error matching candidates: {str(e)}")
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,265 @@
+"""
+Two-stage candidate matching module.
+Ranks indexed resumes against a job description: a coarse search over one
+centroid vector per resume builds a shortlist, which is then rescored at
+chunk level.
+"""
+
+import pickle
+from pathlib import Path
+from typing import List, Optional
+import faiss
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Return a float32, L2-normalized copy of the given row vectors."""
+    vectors = np.array(vectors, dtype=np.float32, copy=True)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+class CandidateIndex:
+    """Per-resume centroid index for shortlisting plus chunk vectors for rescoring."""
+    
+    def __init__(self, nlist: int = 0, nprobe: int = 16):
+        """
+        Initialize the CandidateIndex.
+        
+        Args:
+            nlist: IVF clusters for the coarse stage (0 = exact flat search)
+            nprobe: IVF clusters probed per query
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.resume_ids: List[str] = []
+        self.chunks: List[str] = []
+        self.chunk_vectors: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self.centroid_index: Optional[faiss.Index] = None
+        self._pending_vectors: List[np.ndarray] = []
+    
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+    
+    def add_resume(self, resume_id: str, chunks: List[str], vectors: np.ndarray) -> None:
+        """
+        Queue one resume for indexing. Call build() once all resumes are added.
+        
+        Args:
+            resume_id: Unique resume identifier
+            chunks: Text chunks of the resume
+            vectors: Chunk embeddings of shape (len(chunks), dimension)
+        """
+        if len(chunks) == 0:
+            return
+        if len(chunks) != len(vectors):
+            raise ValueError(f"Resume '{resume_id}' has {len(chunks)} chunks but {len(vectors)} vectors")
+        
+        self.resume_ids.append(resume_id)
+        self.chunks.extend(chunks)
+        self._pending_vectors.append(np.asarray(vectors, dtype=np.float32))
+    
+    def build(self) -> None:
+        """Stack queued chunk vectors and build the coarse centroid index."""
+        if not self._pending_vectors:
+            raise ValueError("Cannot build candidate index without resumes")
+        
+        counts = np.array([len(v) for v in self._pending_vectors], dtype=np.int64)
+        vectors = np.vstack(self._pending_vectors)
+        self._pending_vectors = []
+        
+        self._build(vectors, counts)
+    
+    @classmethod
+    def from_arrays(cls, resume_ids: List[str], chunk_vectors: np.ndarray, chunk_counts: np.ndarray,
+                    chunks: Optional[List[str]] = None, nlist: int = 0, nprobe: int = 16) -> "CandidateIndex":
+        """
+        Build an index from pre-stacked chunk vectors, grouped by resume.
+        
+        Args:
+            resume_ids: Resume identifiers, in the order their chunks are stacked
+            chunk_vectors: Chunk embeddings of all resumes, shape (total_chunks, dimension)
+            chunk_counts: Number of chunks of each resume (all > 0)
+            chunks: Chunk texts aligned with chunk_vectors (empty strings if omitted)
+            nlist: IVF clusters for the coarse stage (0 = exact flat search)
+            nprobe: IVF clusters probed per query
+        
+        Returns:
+            Built CandidateIndex
+        """
+        index = cls(nlist=nlist, nprobe=nprobe)
+        index.resume_ids = list(resume_ids)
+        index.chunks = list(chunks) if chunks is not None else [""] * len(chunk_vectors)
+        index._build(chunk_vectors, np.asarray(chunk_counts, dtype=np.int64))
+        return index
+    
+    def _build(self, vectors: np.ndarray, counts: np.ndarray) -> None:
+        """Normalize chunk vectors, compute resume centroids and index them."""
+        if np.any(counts <= 0):
+            raise ValueError("Every resume must have at least one chunk")
+        
+        self.chunk_vectors = _normalize(vectors)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        
+        # One centroid per resume: the normalized mean of its chunk vectors
+        sums = np.add.reduceat(self.chunk_vectors, self.offsets[:-1], axis=0)
+        centroids = _normalize(sums / counts[:, None])
+        
+        dimension = centroids.shape[1]
+        if self.nlist and len(centroids) >= self.nlist:
+            quantizer = faiss.IndexFlatIP(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, self.nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(centroids)
+            index.nprobe = self.nprobe
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        index.add(centroids)
+        self.centroid_index = index
+    
+    def match(self, query_vector: np.ndarray, top_k: int = 10, shortlist_size: int = 200,
+              chunks_per_candidate: int = 3) -> List[dict]:
+        """
+        Rank resumes against a query with coarse shortlisting and chunk-level rescoring.
+        
+        Args:
+            query_vector: Query embedding of shape (dimension,)
+            top_k: Number of candidates to return
+            shortlist_size: Number of resumes kept by the coarse stage
+            chunks_per_candidate: Best-matching chunks returned per candidate
+        
+        Returns:
+            Candidates sorted by score, each with "resume_id", "score" and "chunks"
+        """
+        if self.centroid_index is None:
+            raise ValueError("Candidate index not built. Call build() first.")
+        
+        query = _normalize(np.reshape(query_vector, (1, -1)))
+        
+        # Stage 1: shortlist resumes by centroid similarity
+        shortlist_size = min(max(shortlist_size, top_k), len(self.resume_ids))
+        _, ids = self.centroid_index.search(query, shortlist_size)
+        shortlist = ids[0][ids[0] >= 0]
+        if len(shortlist) == 0:
+            return []
+        
+        # Stage 2: rescore every chunk of the shortlisted resumes
+        starts = self.offsets[shortlist]
+        lengths = self.offsets[shortlist + 1] - starts
+        segment_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        rows = np.repeat(starts - segment_starts, lengths) + np.arange(lengths.sum())
+        scores = self.chunk_vectors[rows] @ query[0]
+        
+        resume_scores = np.maximum.reduceat(scores, segment_starts)
+        
+        return self._rank(shortlist, resume_scores, rows, scores, segment_starts, top_k, chunks_per_candidate)
+    
+    def exhaustive_match(self, query_vector: np.ndarray, top_k: int = 10,
+                         chunks_per_candidate: int = 3) -> List[dict]:
+        """
+        Rank resumes by scoring every chunk of every resume (reference for match()).
+        
+        Args:
+            query_vector: Query embedding of shape (dimension,)
+            top_k: Number of candidates to return
+            chunks_per_candidate: Best-matching chunks returned per candidate
+        
+        Returns:
+            Candidates sorted by score, each with "resume_id", "score" and "chunks"
+        """
+        if self.chunk_vectors is None:
+            raise ValueError("Candidate index not built. Call build() first.")
+        
+        query = _normalize(np.reshape(query_vector, (1, -1)))
+        scores = self.chunk_vectors @ query[0]
+        resume_scores = np.maximum.reduceat(scores, self.offsets[:-1])
+        
+        candidates = np.arange(len(self.resume_ids))
+        rows = np.arange(len(scores))
+        return self._rank(candidates, resume_scores, rows, scores, self.offsets[:-1], top_k, chunks_per_candidate)
+    
+    def _rank(self, candidates: np.ndarray, resume_scores: np.ndarray, rows: np.ndarray,
+              scores: np.ndarray, segment_starts: np.ndarray, top_k: int,
+              chunks_per_candidate: int) -> List[dict]:
+        """Pick the top_k candidates and their best chunks from per-chunk scores."""
+        top_k = min(top_k, len(candidates))
+        if top_k <= 0:
+            return []
+        top = np.argpartition(-resume_scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-resume_scores[top])]
+        
+        segment_ends = np.append(segment_starts[1:], len(scores))
+        results = []
+        for position in top:
+            start, end = segment_starts[position], segment_ends[position]
+            best = start + np.argsort(-scores[start:end])[:chunks_per_candidate]
+            results.append({
+                "resume_id": self.resume_ids[candidates[position]],
+                "score": float(resume_scores[position]),
+                "chunks": [
+                    {"text": self.chunks[rows[i]], "score": float(scores[i])}
+                    for i in best
+                ],
+            })
+        
+        return results
+
+
+def load_candidate_index(indexes_dir: Path, nlist: int = 0, nprobe: int = 16) -> Optional[CandidateIndex]:
+    """
+    Build a CandidateIndex from the per-resume FAISS indexes in a directory.
+    
+    Each resume is stored as "<resume_id>" plus "<resume_id>_chunks.pkl", the
+    layout written by VectorStore.save_index(). Resumes that fail to load, whose
+    chunk and vector counts differ, or whose embedding dimension differs from the
+    first loaded resume are skipped with a warning. Files are read directly rather
+    than through VectorStore to keep startup logging to one summary line.
+    
+    Args:
+        indexes_dir: Directory holding one FAISS index per resume id
+        nlist: IVF clusters for the coarse stage (0 = exact flat search)
+        nprobe: IVF clusters probed per query
+    
+    Returns:
+        Built CandidateIndex, or None if no resume indexes were found
+    """
+    indexes_dir = Path(indexes_dir)
+    if not indexes_dir.exists():
+        return None
+    
+    candidate_index = CandidateIndex(nlist=nlist, nprobe=nprobe)
+    suffix = "_chunks.pkl"
+    dimension = None
+    
+    for chunks_path in sorted(indexes_dir.glob(f"*{suffix}")):
+        resume_id = chunks_path.name[:-len(suffix)]
+        index_path = indexes_dir / resume_id
+        if not index_path.exists():
+            continue
+        
+        try:
+            index = faiss.read_index(str(index_path))
+            with open(chunks_path, 'rb') as f:
+                chunks = pickle.load(f)
+        except Exception as e:
+            print(f"WARNING: Skipping resume '{resume_id}': failed to load index: {str(e)}")
+            continue
+        
+        if dimension is None:
+            dimension = index.d
+        elif index.d != dimension:
+            print(f"WARNING: Skipping resume '{resume_id}': embedding dimension "
+                  f"{index.d} does not match {dimension}")
+            continue
+        
+        try:
+            candidate_index.add_resume(resume_id, chunks, index.reconstruct_n(0, index.ntotal))
+        except ValueError as e:
+            print(f"WARNING: Skipping resume '{resume_id}': {str(e)}")
+    
+    if len(candidate_index) == 0:
+        return None
+    
+    candidate_index.build()
+    print(f"Built candidate index with {len(candidate_index)} resumes and {len(candidate_index.chunks)} chunks")
+    return candidate_index
@@ -87,6 +87,25 @@ class ResumeRAG:
         if not relevant_chunks or len(relevant_chunks) == 0:
             relevant_chunks = self.vector_store.search(question, k=k*2)
         
+        return self.answer_from_chunks(question, relevant_chunks)
+    
+    def answer_from_chunks(self, question: str, relevant_chunks: List[str]) -> str:
+        """
+        Answer a question from chunks that were already retrieved.
+        
+        Args:
+            question: User's question about the resume
+            relevant_chunks: Resume chunks to use as context
+            
+        Returns:
+            Direct answer string based on the given chunks
+        """
+        question = question.strip()
+        
+        # Handle greetings
+        if self._is_greeting(question):
+            return self._handle_greeting(question)
+        
         # Combine chunks into context
         context = "\n\n".join(relevant_chunks) if relevant_chunks else ""
         
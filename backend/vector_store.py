@@ -15,7 +15,8 @@ from langchain_openai import OpenAIEmbeddings
 class VectorStore:
     """Manages FAISS vector store for resume embeddings."""
     
-    def __init__(self, openai_api_key: str, index_path: str = "faiss_index", embedding_model: str = "text-embedding-3-large"):
+    def __init__(self, openai_api_key: str, index_path: str = "faiss_index", embedding_model: str = "text-embedding-3-large",
+                 embeddings: Optional[OpenAIEmbeddings] = None):
         """
         Initialize the VectorStore.
         
@@ -23,9 +24,10 @@ class VectorStore:
             openai_api_key: OpenAI API key for embeddings
             index_path: Path to save/load FAISS index
             embedding_model: OpenAI embedding model name
+            embeddings: Existing embeddings client to share between stores
         """
         self.index_path = Path(index_path)
-        self.embeddings = OpenAIEmbeddings(
+        self.embeddings = embeddings or OpenAIEmbeddings(
             model=embedding_model,
             openai_api_key=openai_api_key
         )
@@ -104,6 +106,43 @@ class VectorStore:
             print(f"Failed to load index: {str(e)}")
             return False
     
+    def embed_queries(self, queries: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Embed several queries with batched embedding API calls.
+        
+        Args:
+            queries: Query strings to embed
+            batch_size: Number of queries sent per API call
+            
+        Returns:
+            Array of shape (len(queries), dimension)
+        """
+        vectors: List[List[float]] = []
+        for start in range(0, len(queries), batch_size):
+            vectors.extend(self.embeddings.embed_documents(queries[start:start + batch_size]))
+        
+        return np.array(vectors, dtype=np.float32)
+    
+    def search_by_vectors(self, query_vectors: np.ndarray, k: int = 4) -> List[List[str]]:
+        """
+        Search for the most relevant chunks of several pre-computed query embeddings.
+        
+        Args:
+            query_vectors: Array of shape (n_queries, dimension)
+            k: Number of top results to return per query
+            
+        Returns:
+            List of top k most relevant chunks for each query
+        """
+        if self.index is None:
+            raise ValueError("Index not initialized. Create or load index first.")
+        
+        # Search FAISS index with all queries in one call
+        distances, indices = self.index.search(query_vectors, min(k, self.index.ntotal))
+        
+        # Retrieve chunks (FAISS pads missing results with -1)
+        return [[self.chunks[idx] for idx in row if idx >= 0] for row in indices]
+    
     def search(self, query: str, k: int = 4) -> List[str]:
         """
         Search for most relevant chunks.
@@ -122,10 +161,4 @@ class VectorStore:
         query_embedding = self.embeddings.embed_query(query)
         query_vector = np.array([query_embedding], dtype=np.float32)
         
-        # Search FAISS index
-        distances, indices = self.index.search(query_vector, min(k, self.index.ntotal))
-        
-        # Retrieve chunks
-        results = [self.chunks[idx] for idx in indices[0]]
-        
-        return results
+        return self.search_by_vectors(query_vector, k=k)[0]